@@ -9,13 +9,23 @@ MEXC 세션 랭킹봇 (GitHub Actions 단발 실행)
   * |Δ| ≥ 2.00% → 상승 🚀 / 하락 💥
 - 출력 심볼: 'ETH/USDT:USDT' → 'ETH' 처럼 심플
 - 대상: watchlist.json 전 종목
+- 수집: ccxt async_support + asyncio.gather 병렬(CONCURRENCY 상한)
 - 전송: 텔레그램(4096자 제한 대비 분할)
 """
 
 import os
+import re
 import json
+import html
+import ssl
 import time
-import requests
+import random
+import heapq
+import hashlib
+import asyncio
+import aiohttp
+import certifi
+from operator import itemgetter
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional, Tuple
 
@@ -25,7 +35,13 @@ try:
 except Exception:
     pass
 
-import ccxt
+try:
+    import orjson  # 있으면 JSON 파싱/직렬화 가속
+except ImportError:
+    orjson = None
+
+import ccxt.async_support as ccxt
+import numpy as np
 
 # ── 환경 변수 ────────────────────────────────────────────────
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
@@ -37,10 +53,24 @@ TREND_COUNT        = int(os.getenv("TREND_COUNT", "4"))            # 4칸
 LINES_PER_MESSAGE  = int(os.getenv("LINES_PER_MESSAGE", "9999"))   # 랭킹 줄 기준 분할
 DELTA_EMOJI_THRESH = float(os.getenv("DELTA_EMOJI_THRESH", "2.0")) # 2.00%
 FIRST_RUN          = os.getenv("FIRST_RUN", "false").lower() in ("1", "true", "yes")
+CONCURRENCY        = int(os.getenv("CONCURRENCY", "16"))           # 동시 요청 상한
+CACHE_DIR          = os.getenv("CACHE_DIR", ".cache")
+MARKETS_CACHE_TTL  = int(os.getenv("MARKETS_CACHE_TTL", "21600"))  # 6시간
+CACHE_DISABLE      = os.getenv("CACHE_DISABLE", "false").lower() in ("1", "true", "yes")
 
 if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
     raise RuntimeError("⚠️ TELEGRAM_BOT_TOKEN / TELEGRAM_CHAT_ID 가 비었어요.")
 
+TELEGRAM_URL     = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+TELEGRAM_TIMEOUT = aiohttp.ClientTimeout(total=20)
+MESSAGE_MAX_LEN  = 3900  # 텔레그램 4096 한도(UTF-16 기준)에서 여유 약 200
+TELEGRAM_RETRIES = 3     # 429 / 5xx / 네트워크 오류 재시도 횟수
+
+TIMEFRAME_MS  = ccxt.Exchange.parse_timeframe(TIMEFRAME) * 1000  # 봉 길이(ms), import 시 1회만 계산
+TREND_TIMEFRAME = "5m"                                            # 30분 트렌드는 항상 5m 기준
+TREND_TF_MS     = ccxt.Exchange.parse_timeframe(TREND_TIMEFRAME) * 1000
+OHLCV_RETRIES = 3  # 429 / DDoSProtection / 타임아웃 등 NetworkError 재시도 횟수
+
 # ── 시간 유틸 ────────────────────────────────────────────────
 KST = timezone(timedelta(hours=9))
 
@@ -60,51 +90,140 @@ def latest_5am_kst_at_or_before(now_utc: datetime) -> datetime:
     today_05 = now_kst.replace(hour=5, minute=0, second=0, microsecond=0)
     return today_05 if now_kst >= today_05 else (today_05 - timedelta(days=1))
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ONE_MS = timedelta(milliseconds=1)
+
 def to_ms(dt: datetime) -> int:
-    return int(dt.astimezone(timezone.utc).timestamp() * 1000)
+    # tz-aware 전제: astimezone/float 변환 없이 정수 나눗셈
+    return (dt - _EPOCH) // _ONE_MS
 
 # ── 텔레그램 ────────────────────────────────────────────────
-def send_telegram(text: str) -> None:
-    url  = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-    data = {"chat_id": TELEGRAM_CHAT_ID, "text": text}
+def telegram_retry_after(body: str) -> Optional[float]:
+    # 429 응답: {"parameters": {"retry_after": 5}, ...}
     try:
-        r = requests.post(url, data=data, timeout=20)
-        if r.status_code != 200:
-            print(f"[텔레그램 오류] {r.text}")
-    except Exception as e:
-        print(f"[텔레그램 전송 실패] {e}")
+        return float(json_loads(body)["parameters"]["retry_after"])
+    except Exception:
+        return None
+
+async def send_telegram(session: aiohttp.ClientSession, text: str) -> None:
+    # session은 실행 전체에서 공유 → 분할 메시지도 TLS 연결 재사용
+    data = {"chat_id": TELEGRAM_CHAT_ID, "text": text, "parse_mode": "HTML"}
+    delay, error = 0.0, ""
+    for attempt in range(TELEGRAM_RETRIES):
+        if delay:
+            await asyncio.sleep(delay)
+        backoff = 0.5 * 2 ** attempt
+        try:
+            async with session.post(TELEGRAM_URL, data=data, timeout=TELEGRAM_TIMEOUT) as r:
+                if r.status == 200:
+                    return
+                status, body = r.status, await r.text()
+        except Exception as e:
+            error, delay = f"[텔레그램 전송 실패] {e}", backoff
+            continue
+        error = f"[텔레그램 오류] {body}"
+        if status != 429 and status < 500:
+            break  # 4xx(포맷/권한 등)는 재시도해도 동일
+        delay = telegram_retry_after(body) or backoff
+    print(error)
+
+# ── JSON ────────────────────────────────────────────────────
+def json_loads(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def json_dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
 
 # ── MEXC + 워치리스트 ───────────────────────────────────────
-def create_mexc_swap():
-    ex = ccxt.mexc({"enableRateLimit": True, "options": {"defaultType": "swap"}})
-    ex.load_markets()
+def markets_cache_path() -> str:
+    return os.path.join(CACHE_DIR, "markets_mexc.json")
+
+def load_markets_cache(path: str, ttl_seconds: int) -> Optional[Dict]:
+    try:
+        with open(path, "rb") as f:
+            data = json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or time.time() - data.get("saved_at", 0) > ttl_seconds:
+        return None
+    markets = data.get("markets")
+    return markets if isinstance(markets, dict) and markets else None
+
+def save_markets_cache(path: str, markets: Dict) -> None:
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json_dumps({"saved_at": time.time(), "markets": markets}))
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"[마켓 캐시 저장 실패] {e}")
+
+def create_http_session() -> aiohttp.ClientSession:
+    # ccxt와 텔레그램이 같이 쓰는 커넥션 풀: keep-alive 길게, DNS 캐시 5분
+    # 세션을 주입하면 ccxt가 자체 커넥터(certifi CA)를 안 만드므로 같은 CA 번들로 SSL 컨텍스트를 직접 구성
+    ssl_context = ssl.create_default_context(cafile=certifi.where())
+    connector = aiohttp.TCPConnector(ssl=ssl_context, limit=CONCURRENCY * 2, keepalive_timeout=75, ttl_dns_cache=300, enable_cleanup_closed=True)
+    return aiohttp.ClientSession(connector=connector)
+
+async def create_mexc_swap(session: aiohttp.ClientSession):
+    # session을 주입하면 ccxt는 닫지 않음(own_session=False) → 종료는 호출 측 책임
+    ex = ccxt.mexc({"enableRateLimit": True, "options": {"defaultType": "swap"}, "session": session})
+    if orjson is not None:
+        # 응답 파싱을 orjson으로 교체 (숫자는 문자열 대신 float로 들어옴, safe_number가 둘 다 처리)
+        ex.quoteJsonNumbers = False
+        ex.on_json_response = orjson.loads
+    try:
+        # 캐시가 신선하면 load_markets(대용량 JSON) 생략, 깨졌으면 라이브 로드
+        cached = None if CACHE_DISABLE else load_markets_cache(markets_cache_path(), MARKETS_CACHE_TTL)
+        if cached:
+            try:
+                ex.set_markets(cached)
+            except Exception as e:
+                print(f"[마켓 캐시 무효] {e}")
+                cached = None
+        if not cached:
+            await ex.load_markets()
+            if not CACHE_DISABLE:
+                save_markets_cache(markets_cache_path(), ex.markets)
+    except Exception:
+        await ex.close()
+        raise
     return ex
 
 def load_watchlist(path: str) -> List[str]:
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    with open(path, "rb") as f:
+        data = json_loads(f.read())
     if not isinstance(data, list):
         raise ValueError("watchlist.json 포맷은 리스트여야 해요.")
-    return [s.strip() for s in data if isinstance(s, str) and s.strip()]
-
-def resolve_symbol_for_mexc(raw: str, markets: Dict) -> Optional[str]:
-    candidates = [
-        raw,
-        raw.replace("/USDT:USDT", "_USDT"),
-        raw.replace("/USDT", "_USDT"),
-        raw.replace("-USDT-SWAP", "_USDT"),
+    symbols = [s for s in (x.strip() for x in data if isinstance(x, str)) if s]
+    # 중복 제거(순서 유지) → 같은 심볼을 두 번 요청하지 않음
+    deduped = list(dict.fromkeys(symbols))
+    if len(deduped) < len(symbols):
+        print(f"[워치리스트] 중복 {len(symbols) - len(deduped)}개 제거")
+    return deduped
+
+def build_symbol_index(markets: Dict) -> Dict[str, str]:
+    # 활성 USDT 무기한만: 통합 심볼/거래소 id/흔한 표기(BTC/USDT, BTC_USDT, BTC-USDT-SWAP) → 통합 심볼
+    swaps = [
+        m for m in markets.values()
+        if (m.get("type") == "swap") and (m.get("quote") == "USDT") and m.get("active", True)
     ]
-    seen, unique = set(), []
-    for c in candidates:
-        if c not in seen:
-            seen.add(c)
-            unique.append(c)
-    for c in unique:
-        if c in markets:
-            m = markets[c]
-            if (m.get("type") == "swap") and (m.get("quote") == "USDT") and m.get("active", True):
-                return c
-    return None
+    index = {m["symbol"]: m["symbol"] for m in swaps}
+    for m in swaps:
+        sym  = m["symbol"]
+        pair = sym.split(":")[0]
+        for alias in (m.get("id"), pair, pair.replace("/", "_"), pair.replace("/", "-") + "-SWAP"):
+            if alias:
+                index.setdefault(alias, sym)
+    return index
+
+def resolve_symbol_for_mexc(raw: str, symbol_index: Dict[str, str]) -> Optional[str]:
+    return symbol_index.get(raw)
 
 def pretty_symbol(sym: str) -> str:
     if "/USDT:USDT" in sym: return sym.split("/")[0]
@@ -113,26 +232,127 @@ def pretty_symbol(sym: str) -> str:
     if sym.endswith("-USDT-SWAP"): return sym[:-10]
     return sym
 
-# ── 전일 세션 랭킹(저→고) ──────────────────────────────────
-def compute_session_performance(ex, symbol: str, since_ms: int, until_ms: int, timeframe: str) -> Optional[Dict]:
+# ── 마감 세션 OHLCV 캐시 ────────────────────────────────────
+def session_cache_path(symbol: str, timeframe: str, since_ms: int, until_ms: int) -> str:
+    # 전일 세션은 이미 마감 → (심볼, 타임프레임, 구간) 키면 TTL 없이 재사용 가능
+    key = hashlib.md5(f"{symbol}|{timeframe}|{since_ms}|{until_ms}".encode()).hexdigest()
+    return os.path.join(CACHE_DIR, "ohlcv", re.sub(r"[^A-Za-z0-9]+", "_", symbol), f"{key}.json")
+
+def load_session_cache(path: str) -> Optional[List[List[float]]]:
+    if CACHE_DISABLE:
+        return None
     try:
-        ohlcv = ex.fetch_ohlcv(symbol, timeframe=timeframe, since=since_ms, limit=800)
+        with open(path, "rb") as f:
+            rows = json_loads(f.read()).get("rows")
+    except (OSError, ValueError, AttributeError):
+        return None
+    return rows if isinstance(rows, list) and rows else None
+
+def save_session_cache(path: str, rows: List[List[float]]) -> None:
+    if CACHE_DISABLE:
+        return
+    try:
+        folder = os.path.dirname(path)
+        os.makedirs(folder, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(json_dumps({"ts": time.time(), "rows": rows}))
+        os.replace(tmp_path, path)
+        # 지난 세션 파일은 더 안 쓰므로 정리
+        for name in os.listdir(folder):
+            if name != os.path.basename(path):
+                os.remove(os.path.join(folder, name))
+    except OSError as e:
+        print(f"[OHLCV 캐시 저장 실패] {e}")
+
+# ── OHLCV 수집(심볼당 1회) ──────────────────────────────────
+def candle_limit(start_ms: int, end_ms: int, tf_ms: int) -> int:
+    # start~end 구간 봉 개수 + 경계 여유 2개
+    return (end_ms - start_ms) // tf_ms + 2
+
+async def fetch_ohlcv_retry(ex, symbol: str, timeframe: str, tf_ms: int, since_ms: int, end_ms: int) -> List[List[float]]:
+    # 일시적 오류(ccxt NetworkError 계열)만 지수 백오프+지터로 재시도, 그 외/마지막 실패는 호출 측으로
+    for attempt in range(OHLCV_RETRIES):
+        try:
+            return await ex.fetch_ohlcv(symbol, timeframe=timeframe, since=since_ms, limit=candle_limit(since_ms, end_ms, tf_ms), params={"until": end_ms})
+        except ccxt.NetworkError:
+            if attempt == OHLCV_RETRIES - 1:
+                raise
+            await asyncio.sleep(0.5 * 2 ** attempt + random.random() * 0.25)
+
+async def fetch_remaining(ex, symbol: str, rows: List[List[float]], timeframe: str, tf_ms: int, end_ms: int) -> List[List[float]]:
+    # 응답이 행 수 상한(MEXC 2000개)에 잘려 end 봉까지 못 오면 끝난 지점부터 이어 받기
+    last_bar = end_ms - end_ms % tf_ms
+    while rows and rows[-1][0] < last_bar:
+        try:
+            extra = await fetch_ohlcv_retry(ex, symbol, timeframe, tf_ms, rows[-1][0] + tf_ms, end_ms)
+        except Exception as e:
+            print(f"[OHLCV 보충 실패] {symbol} - {e}")
+            break
+        last_ts = rows[-1][0]
+        extra = [row for row in extra if row[0] > last_ts]
+        if not extra:
+            break  # 더 받을 봉이 없음(거래 정지 등) → 무한 반복 방지
+        rows = rows + extra
+    return rows
+
+async def fetch_symbol_ohlcv(ex, symbol: str, since_ms: int, until_ms: int, base_ms: int, now_ms: int) -> Optional[List[List[float]]]:
+    # FUSED_TREND면 전일 세션 시작부터 현재까지 한 번에 받아서 랭킹/트렌드가 같이 씀, 아니면 세션 구간만
+    # (세션 캐시가 있으면 트렌드 구간만 받음, until로 서버 쪽 구간 끝도 명시)
+    end_ms = now_ms if FUSED_TREND else until_ms
+    cache_path = session_cache_path(symbol, TIMEFRAME, since_ms, until_ms)
+    session_rows = load_session_cache(cache_path)
+    if session_rows and not FUSED_TREND:
+        return session_rows
+    fetch_from = base_ms if session_rows else since_ms
+    try:
+        rows = await fetch_ohlcv_retry(ex, symbol, TIMEFRAME, TIMEFRAME_MS, fetch_from, end_ms)
     except Exception as e:
         print(f"[OHLCV 실패] {symbol} - {e}")
-        return None
-    if not ohlcv:
-        return None
+        return session_rows
 
-    rows = [row for row in ohlcv if since_ms <= row[0] <= until_ms]
-    if len(rows) < 2:
+    if session_rows:
+        last_ts = session_rows[-1][0]
+        return await fetch_remaining(ex, symbol, session_rows + [row for row in rows if row[0] > last_ts], TIMEFRAME, TIMEFRAME_MS, end_ms)
+    rows = await fetch_remaining(ex, symbol, rows, TIMEFRAME, TIMEFRAME_MS, end_ms)
+
+    # 세션 마지막 봉까지 받은 경우에만 캐시 (중간에 잘린 응답은 저장 X)
+    session = [row for row in rows if since_ms <= row[0] <= until_ms]
+    if session and session[-1][0] == until_ms - until_ms % TIMEFRAME_MS:
+        save_session_cache(cache_path, session)
+    return rows
+
+async def fetch_trend_ohlcv(ex, symbol: str, base_ms: int, now_ms: int) -> Optional[List[List[float]]]:
+    # TIMEFRAME이 30분을 못 나누면(1h/4h/1d 등) 트렌드용 5m를 05:00부터 따로 받음
+    try:
+        rows = await fetch_ohlcv_retry(ex, symbol, TREND_TIMEFRAME, TREND_TF_MS, base_ms, now_ms)
+    except Exception as e:
+        print(f"[트렌드 실패] {symbol} - {e}")
         return None
+    return await fetch_remaining(ex, symbol, rows, TREND_TIMEFRAME, TREND_TF_MS, now_ms)
+
+def to_columns(rows: List[List[float]]) -> np.ndarray:
+    # AoS(행 리스트) → SoA: shape (6, N), 각 행(ts/o/h/l/c/v)이 연속 메모리
+    return np.ascontiguousarray(np.asarray(rows, dtype=np.float64).reshape(-1, 6).T)
 
-    lows  = [(ts, low)  for ts, _, _, low,  _, _ in rows]
-    low_ts,  low_price  = min(lows,  key=lambda x: x[1])
+def slice_by_time(cols: np.ndarray, lo_ms: int, hi_ms: Optional[int] = None) -> np.ndarray:
+    # 타임스탬프 오름차순 전제, lo_ms <= ts (<= hi_ms) 구간을 이진탐색으로 자름
+    ts = cols[0]
+    lo = int(np.searchsorted(ts, lo_ms, side="left"))
+    hi = ts.shape[0] if hi_ms is None else int(np.searchsorted(ts, hi_ms, side="right"))
+    return cols[:, lo:hi]
 
-    after_low           = [row for row in rows if row[0] >= low_ts]
-    highs_after_low     = [(ts, high) for ts, _, high, _, _, _ in after_low]
-    high_ts, high_price = max(highs_after_low, key=lambda x: x[1])
+# ── 전일 세션 랭킹(저→고) ──────────────────────────────────
+def compute_session_performance(cols: np.ndarray, symbol: str, since_ms: int, until_ms: int) -> Optional[Dict]:
+    ts, _, high, low, _, _ = slice_by_time(cols, since_ms, until_ms)
+    if ts.shape[0] < 2:
+        return None
+
+    # 저점 → 저점 이후 고점 (argmin/argmax 모두 첫 번째 극값 기준)
+    lo_i = int(low.argmin())
+    hi_i = lo_i + int(high[lo_i:].argmax())
+    low_ts,  low_price  = int(ts[lo_i]), float(low[lo_i])
+    high_ts, high_price = int(ts[hi_i]), float(high[hi_i])
 
     pct = 0.0
     if low_price > 0 and high_price >= low_price:
@@ -141,65 +361,78 @@ def compute_session_performance(ex, symbol: str, since_ms: int, until_ms: int, t
     return {"symbol": symbol, "pct": pct, "low": low_price, "high": high_price, "low_ts": low_ts, "high_ts": high_ts}
 
 # ── 5m→30m 집계 & Δ/range% 계산 ────────────────────────────
-def aggregate_to_30m(ohlcv_5m: List[List[float]]) -> List[List[float]]:
-    # return: [ [ts30, open, high, low, close, volume], ... ]
-    buckets: Dict[int, List[float]] = {}
-    for ts, o, h, l, c, v in ohlcv_5m:
-        k = ts - (ts % (30*60*1000))
-        if k not in buckets:
-            buckets[k] = [o, h, l, c, v]
-        else:
-            bo, bh, bl, bc, bv = buckets[k]
-            buckets[k] = [bo, max(bh, h), min(bl, l), c, bv + v]
-    out = []
-    for k in sorted(buckets.keys()):
-        o,h,l,c,v = buckets[k]
-        out.append([k, o, h, l, c, v])
-    return out
-
-def last_n_deltas_and_ranges_30m(ex, symbol: str, base_5am_kst: datetime, now_utc: datetime, n: int) -> Tuple[List[float], List[float]]:
-    start_ms = to_ms(base_5am_kst)
-    try:
-        ohlcv_5m = ex.fetch_ohlcv(symbol, timeframe="5m", since=start_ms, limit=1000)
-    except Exception as e:
-        print(f"[트렌드 실패] {symbol} - {e}")
-        return [], []
-    if not ohlcv_5m:
+BUCKET_30M_MS = 30 * 60 * 1000
+FUSED_TREND   = BUCKET_30M_MS % TIMEFRAME_MS == 0  # 30분을 나누는 봉이면 랭킹과 같은 응답으로 트렌드 집계
+
+def aggregate_to_30m(cols: np.ndarray) -> np.ndarray:
+    # return: shape (6, K) [ts30, open, high, low, close, volume] (입력은 ts 오름차순, 비어있지 않음)
+    ts, o, h, l, c, v = cols
+    bucket = (ts // BUCKET_30M_MS).astype(np.int64)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket)) + 1))
+    ends   = np.append(starts[1:] - 1, ts.shape[0] - 1)
+    return np.vstack((
+        bucket[starts] * BUCKET_30M_MS,
+        o[starts],
+        np.maximum.reduceat(h, starts),
+        np.minimum.reduceat(l, starts),
+        c[ends],
+        np.add.reduceat(v, starts),
+    ))
+
+def last_n_deltas_and_ranges_30m(cols: np.ndarray, base_ms: int, now_ms: int, n: int) -> Tuple[List[float], List[float]]:
+    # base_ms/now_ms는 main에서 한 번만 변환해서 넘김 (심볼마다 datetime 연산 X)
+    cols_5m = slice_by_time(cols, base_ms)
+    if cols_5m.shape[1] == 0:
         return [], []
 
-    c30 = aggregate_to_30m(ohlcv_5m)
-    if len(c30) < 2:
+    c30 = aggregate_to_30m(cols_5m)
+    if c30.shape[1] < 2:
         return [], []
 
-    # 현재 시각을 넘지 않는 30분 경계까지만 사용
-    now_kst = now_utc.astimezone(KST)
-    valid = [row for row in c30 if row[0] <= to_ms(now_kst)]
-    if len(valid) < 2:
+    # 현재 시각을 넘지 않는 30분 경계까지만 사용 (ts 오름차순 → 이진탐색)
+    valid = c30[:, :np.searchsorted(c30[0], now_ms, side="right")]
+    if valid.shape[1] < 2:
         return [], []
 
-    deltas, ranges = [], []
-    for i in range(1, len(valid)):
-        _, o, h, l, c, _ = valid[i]
-        _, _, _, _, prev_c, _ = valid[i-1]
+    _, o, h, l, c, _ = valid[:, 1:]
+    prev_c = valid[4, :-1]
+    # 분모 0 → 0.0 처리 (기존 규칙 유지)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deltas = np.nan_to_num((c - prev_c) / prev_c * 100.0, nan=0.0, posinf=0.0, neginf=0.0)
+        ranges = np.nan_to_num((h - l) / o * 100.0, nan=0.0, posinf=0.0, neginf=0.0)
 
-        delta = (c - prev_c) / prev_c * 100.0 if prev_c else 0.0
-        rng   = (h - l) / o * 100.0 if o else 0.0
+    return deltas[-n:].tolist(), ranges[-n:].tolist()
 
-        deltas.append(delta)
-        ranges.append(rng)
-
-    return deltas[-n:], ranges[-n:]
+# ── 심볼 단위 수집+분석 ─────────────────────────────────────
+async def analyze_symbol(ex, symbol: str, since_ms: int, until_ms: int, base_ms: int, now_ms: int) -> Tuple[Optional[Dict], Tuple[List[float], List[float]]]:
+    # 응답 도착 즉시 분석 → 계산이 다른 심볼의 네트워크 대기와 겹침
+    if FUSED_TREND:
+        rows = trend_rows = await fetch_symbol_ohlcv(ex, symbol, since_ms, until_ms, base_ms, now_ms)
+    else:
+        rows, trend_rows = await asyncio.gather(
+            fetch_symbol_ohlcv(ex, symbol, since_ms, until_ms, base_ms, now_ms),
+            fetch_trend_ohlcv(ex, symbol, base_ms, now_ms),
+        )
+    cols = to_columns(rows or [])  # SoA 변환은 응답당 한 번만
+    trend_cols = cols if FUSED_TREND else to_columns(trend_rows or [])
+    return (
+        compute_session_performance(cols, symbol, since_ms, until_ms),
+        last_n_deltas_and_ranges_30m(trend_cols, base_ms, now_ms, TREND_COUNT),
+    )
 
 # ── 메시지 포맷 & 전송 ─────────────────────────────────────
 def format_block_header(day_label: str) -> str:
     return f"📈 {day_label} 세션(05:00→04:59) 상승률 순위\n"
 
-def format_rank_line(rank: int, symbol: str, pct: float) -> str:
-    name = pretty_symbol(symbol)
-    if rank == 1:   return f"🥇 {name} ({pct:.2f}%)"
-    if rank == 2:   return f"🥈 {name} ({pct:.2f}%)"
-    if rank == 3:   return f"🥉 {name} ({pct:.2f}%)"
-    return f"{rank}. {name} ({pct:.2f}%)"
+def tg_len(text: str) -> int:
+    # 텔레그램 길이는 UTF-16 코드 유닛 기준 (이모지 1개 = 2)
+    return len(text.encode("utf-16-le")) // 2
+
+_MEDALS = {1: "🥇", 2: "🥈", 3: "🥉"}
+
+def format_rank_line(rank: int, name: str, pct: float) -> str:
+    prefix = _MEDALS.get(rank) or f"{rank}."
+    return f"{prefix} {html.escape(name)} ({pct:.2f}%)"
 
 def _fmt_delta(v: float) -> str:
     s = f"{v:+.2f}%"
@@ -221,44 +454,61 @@ def format_range_line(ranges: List[float]) -> str:
     parts = [f"{v:.2f}%" for v in ranges[-TREND_COUNT:]]
     return "🌊  " + " | ".join(parts)
 
-def send_ranked_messages(day_label: str, ranked: List[Dict], trend_map: Dict[str, Tuple[List[float], List[float]]], first_run: bool, now_kst: datetime) -> None:
+async def send_ranked_messages(session: aiohttp.ClientSession, day_label: str, ranked: List[Dict], trend_map: Dict[str, Tuple[List[float], List[float]]], pretty_names: Dict[str, str], first_run: bool, now_kst: datetime) -> None:
     header = format_block_header(day_label)
-    buf = header
+    parts: List[str] = []        # header 뒤에 붙을 조각들, flush 때 한 번만 join
+    buf_len = tg_len(header)
     lines_in_msg = 0
     rank = 1
 
-    def flush():
-        nonlocal buf, lines_in_msg
+    async def flush():
+        nonlocal parts, buf_len, lines_in_msg
         if lines_in_msg > 0:
-            send_telegram(buf.rstrip())
-        buf = header
+            await send_telegram(session, (header + "".join(parts)).rstrip())
+        parts = []
+        buf_len = tg_len(header)
         lines_in_msg = 0
 
     for item in ranked:
         sym = item["symbol"]
         deltas, ranges = trend_map.get(sym, ([], []))
 
-        line1 = format_rank_line(rank, sym, item["pct"])
+        line1 = format_rank_line(rank, pretty_names.get(sym) or pretty_symbol(sym), item["pct"])
         line2 = format_delta_line(deltas, first_run, now_kst)
         line3 = format_range_line(ranges)
-        chunk = ("\n\n" if lines_in_msg > 0 or header in buf else "") + line1 + "\n" + line2 + "\n" + line3
+        block = line1 + "\n" + line2 + "\n" + line3
+        sep   = "\n\n" if lines_in_msg > 0 else ""
 
         # 길이/줄수 제한 처리
-        if lines_in_msg + 1 > LINES_PER_MESSAGE or len(buf) + len(chunk) > 3500:
-            flush()
-            buf += line1 + "\n" + line2 + "\n" + line3
+        block_len = tg_len(block)
+        if lines_in_msg + 1 > LINES_PER_MESSAGE or buf_len + len(sep) + block_len > MESSAGE_MAX_LEN:
+            await flush()
+            parts.append(block)
+            buf_len += block_len
             lines_in_msg = 1
         else:
-            buf += chunk
+            parts.append(sep)
+            parts.append(block)
+            buf_len += len(sep) + block_len
             lines_in_msg += 1
 
         rank += 1
 
-    flush()
+    await flush()
     print("✅ 텔레그램 전송 완료")
 
 # ── 엔트리포인트 ───────────────────────────────────────────
-def main():
+async def gather_bounded(coros, limit: int) -> List:
+    # 세마포어로 동시 소켓 수 제한, 개별 실패는 예외 객체로 반환
+    sem = asyncio.Semaphore(limit)
+
+    async def run(coro):
+        async with sem:
+            return await coro
+
+    return await asyncio.gather(*[run(c) for c in coros], return_exceptions=True)
+
+async def main():
     now_utc = datetime.now(timezone.utc)
     now_kst = now_utc.astimezone(KST)
 
@@ -268,37 +518,49 @@ def main():
 
     # 트렌드 기준 05:00
     base_5am_kst = latest_5am_kst_at_or_before(now_utc)
-
-    ex = create_mexc_swap()
-    markets = ex.markets
-    symbols_raw = load_watchlist(WATCHLIST_PATH)
-
-    valid_syms, invalid_syms = [], []
-    for raw in symbols_raw:
-        resolved = resolve_symbol_for_mexc(raw, markets)
-        (valid_syms if resolved else invalid_syms).append(resolved or raw)
-
-    if invalid_syms:
-        print(f"[경고] MEXC 미지원/포맷 불일치 {len(invalid_syms)}개: {invalid_syms[:10]}{' …' if len(invalid_syms)>10 else ''}")
-
-    # 랭킹
-    results: List[Dict] = []
-    for s in valid_syms:
-        r = compute_session_performance(ex, s, since_ms, until_ms, TIMEFRAME)
-        if r: results.append(r)
-        time.sleep(max(0.15, getattr(ex, "rateLimit", 200) / 1000.0))
-    results.sort(key=lambda x: x["pct"], reverse=True)
-
-    # Δ + range% (마지막 4칸)
-    trend_map: Dict[str, Tuple[List[float], List[float]]] = {}
-    for s in valid_syms:
-        deltas, ranges = last_n_deltas_and_ranges_30m(ex, s, base_5am_kst, now_utc, TREND_COUNT)
-        trend_map[s] = (deltas, ranges)
-        time.sleep(max(0.1, getattr(ex, "rateLimit", 200) / 1000.0))
-
-    # 전송
-    day_label = start_kst.strftime("%Y-%m-%d")
-    send_ranked_messages(day_label, results[:TOP_N], trend_map, FIRST_RUN, now_kst)
+    base_ms, now_ms = to_ms(base_5am_kst), to_ms(now_utc)
+
+    async with create_http_session() as http:
+        ex = await create_mexc_swap(http)
+        try:
+            symbol_index = build_symbol_index(ex.markets)
+            symbols_raw = load_watchlist(WATCHLIST_PATH)
+
+            valid_syms, invalid_syms = [], []
+            for raw in symbols_raw:
+                resolved = resolve_symbol_for_mexc(raw, symbol_index)
+                (valid_syms if resolved else invalid_syms).append(resolved or raw)
+            valid_syms = list(dict.fromkeys(valid_syms))  # 표기만 다른 같은 마켓(BTC_USDT / BTC/USDT 등) 1회만
+
+            pretty_names = {s: pretty_symbol(s) for s in valid_syms}
+
+            if invalid_syms:
+                print(f"[경고] MEXC 미지원/포맷 불일치 {len(invalid_syms)}개: {invalid_syms[:10]}{' …' if len(invalid_syms)>10 else ''}")
+
+            # 전일 세션 시작~현재 OHLCV를 심볼당 1회 수집+분석 (요청 간격은 ccxt enableRateLimit 스로틀이 담당)
+            analyses = await gather_bounded(
+                [analyze_symbol(ex, s, since_ms, until_ms, base_ms, now_ms) for s in valid_syms],
+                CONCURRENCY,
+            )
+        finally:
+            await ex.close()
+
+        # 랭킹 + Δ/range% (마지막 4칸)
+        results: List[Dict] = []
+        trend_map: Dict[str, Tuple[List[float], List[float]]] = {}
+        for s, a in zip(valid_syms, analyses):
+            if isinstance(a, BaseException):
+                # 수집 오류는 fetch_symbol_ohlcv에서 이미 로그 → 여기 오는 건 변환/분석 중 예외
+                print(f"[분석 실패] {s} - {a!r}")
+                continue
+            perf, trend_map[s] = a
+            if perf: results.append(perf)
+        # 상위 TOP_N만 (정렬 후 자르기와 동일한 순서, TOP_N < N이면 O(N log TOP_N))
+        top = heapq.nlargest(TOP_N, results, key=itemgetter("pct"))
+
+        # 전송 (같은 세션 재사용)
+        day_label = start_kst.strftime("%Y-%m-%d")
+        await send_ranked_messages(http, day_label, top, trend_map, pretty_names, FIRST_RUN, now_kst)
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())